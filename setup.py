@@ -15,10 +15,23 @@ def read_requirements(file: str = "requirements.txt") -> list[str]:
     Returns:
         list[str]: requirements of the project
     """
-    with open(file) as f:
+    with open(file, encoding="utf-8") as f:
         return [line.strip() for line in f if line.strip() and not line.startswith("#")]
 
 
+def read_long_description(file: str = "README.md") -> str:
+    """Get the long description of the project.
+
+    Args:
+        file (str, optional): Path to the description. Defaults to "README.md".
+
+    Returns:
+        str: long description of the project
+    """
+    with open(file, encoding="utf-8") as f:
+        return f.read()
+
+
 setup(
     name="prometheus-opensearch-dashboards-exporter",
     version="0.1.0",
@@ -26,7 +39,7 @@ setup(
     author="Gabriel Cocenza",
     author_email="gabriel.cocenza@canonical.com",
     license="Apache License",
-    long_description=open("README.md").read(),
+    long_description=read_long_description(),
     long_description_content_type="text/markdown",
     python_requires=">=3.10",
     packages=find_packages(where="src"),
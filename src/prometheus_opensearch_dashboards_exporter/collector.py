@@ -2,15 +2,26 @@
 # See LICENSE file for licensing details.
 """OpenSearch Dashboards Collector."""
 
+import atexit
+import base64
 import logging
+import socket
+import threading
+import time
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Generator, Iterable, Optional, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Generator, Iterable, Optional, Sequence
 
 import requests
 from prometheus_client.core import GaugeMetricFamily, Metric
-from requests.auth import HTTPBasicAuth
+from prometheus_client.utils import floatToGoString
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError, RequestException, Timeout
+from urllib3 import disable_warnings
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import InsecureRequestWarning
 
 try:  # pragma: no cover
     from prometheus_client.registry import (  # pylint: disable=ungrouped-imports
@@ -31,19 +42,193 @@ except ImportError:  # pragma: no cover
             """Abstract method to collect the metrics"""
 
 
+try:  # pragma: no cover
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    # orjson parses the raw bytes with a C parser several times faster than the stdlib, but it
+    # is an optional speed-up: fall back to the stdlib parser when it is not available.
+    from json import loads as _json_loads
+
+
 METRICS_PREFIX = "opensearch_dashboards_"
 API_STATUS_ENDPOINT = "/api/status"
 
 logger = logging.getLogger(__name__)
 
+# split (connect, read) timeout so a stalled handshake cannot consume the whole scrape budget
+_REQUEST_TIMEOUT = (2.0, 3.0)
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTP adapter forcing TCP_NODELAY and keep-alive on the pooled sockets.
+
+    The scrape is a single small GET, so disabling Nagle avoids delaying it and keep-alive
+    keeps the pooled connection warm between scrapes.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Build the pool manager with the extra socket options.
+
+        Args:
+            args (Any): Positional arguments of HTTPAdapter.init_poolmanager
+            kwargs (Any): Keyword arguments of HTTPAdapter.init_poolmanager
+        """
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    """Build the session shared by every scrape.
+
+    Keeping a single session alive reuses the TCP/TLS connection between scrapes instead of
+    paying a new handshake on each one.
+
+    Returns:
+        requests.Session: session with connection pooling configured.
+    """
+    session = requests.Session()
+    # no retry policy: scrapes must stay within the split request timeout, and a failed
+    # scrape is reported as the data source being down rather than retried
+    adapter = _KeepAliveAdapter(pool_connections=4, pool_maxsize=10)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    session.verify = False
+    # verification is off by default (self-signed certificates are the norm on dashboards
+    # deployments), so silence the per-request insecure warning once instead of paying the
+    # warning machinery on every scrape
+    disable_warnings(InsecureRequestWarning)
+    # the exporter only ever talks to the configured dashboards URL, so skip the per-request
+    # environment lookups (proxy variables, netrc) requests would otherwise do
+    session.trust_env = False
+    return session
+
+
+_SESSION = _build_session()
+atexit.register(_SESSION.close)
+
+
+@lru_cache(maxsize=2)
+def _basic_auth_header(user: str, password: str) -> str:
+    """Build the value of the Basic Authorization header for the given credentials.
+
+    The result is cached so the base64 encoding is not redone on every scrape.
+
+    Args:
+        user (str): User to access the API
+        password (str): Password to access the API
+
+    Returns:
+        str: Value to use in the Authorization header
+    """
+    token = base64.b64encode(f"{user}:{password}".encode()).decode()
+    return f"Basic {token}"
+
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=2)
+def _request_headers(user: str, password: str) -> dict[str, str]:
+    """Build the per-request headers for the given credentials.
+
+    Cached so the headers dictionary is not reallocated on every scrape.
+
+    Args:
+        user (str): User to access the API
+        password (str): Password to access the API
+
+    Returns:
+        dict[str, str]: Headers to send with the status request
+    """
+    return {"Authorization": _basic_auth_header(user, password)}
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Wrap CLI arguments and environment variables necessary to get metrics from the API."""
+    """Wrap CLI arguments and environment variables necessary to get metrics from the API.
+
+    When refresh_interval is greater than zero the API is polled by a background thread on
+    that interval and scrapes serve the cached response; when zero every scrape hits the API.
+    When cache_ttl is greater than zero the last successful response is reused for that many
+    seconds, capping the upstream request rate regardless of the scrape fan-out.
+    When ca_bundle points to a CA bundle file, TLS certificates are verified against it
+    instead of being accepted blindly.
+    """
 
     url: str
     user: str
     password: str
+    refresh_interval: float = 0.0
+    cache_ttl: float = 0.0
+    ca_bundle: Optional[str] = None
+
+
+class _SingleFlight:  # pylint: disable=too-few-public-methods
+    """Coalesce concurrent identical calls so only one executes and the rest share its result.
+
+    The exporter only ever fetches the single configured status endpoint, so concurrent
+    scrapes (e.g. two Prometheus replicas polling at once) can safely share one upstream call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._event: Optional[threading.Event] = None
+        self._result: dict[str, Any] = {}
+
+    def fetch(self, fetcher: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """Run the fetcher, or wait for the call already in flight and share its result.
+
+        Args:
+            fetcher (Callable[[], dict[str, Any]]): Function performing the actual fetch
+
+        Returns:
+            dict[str, Any]: Result of this call or of the call that was already in flight
+        """
+        my_event = threading.Event()
+        with self._lock:
+            in_flight = self._event
+            if in_flight is None:
+                self._event = my_event
+        if in_flight is not None:
+            in_flight.wait()
+            return self._result
+        try:
+            self._result = fetcher()
+        finally:
+            with self._lock:
+                self._event = None
+            my_event.set()
+        return self._result
+
+
+class _MetricsCache:
+    """Thread-safe holder for the last API response fetched by the background refresher."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._value: dict[str, Any] = {}
+        self._fetched_at: float = 0.0
+
+    def update(self, value: dict[str, Any]) -> None:
+        """Store a freshly fetched API response.
+
+        Args:
+            value (dict[str, Any]): Raw response from the API
+        """
+        with self._lock:
+            self._value = value
+            self._fetched_at = time.monotonic()
+
+    def get(self) -> tuple[dict[str, Any], float]:
+        """Get the cached API response and the monotonic time it was fetched.
+
+        Returns:
+            tuple[dict[str, Any], float]: cached response and fetch timestamp (0.0 if the
+            refresher never completed a fetch yet).
+        """
+        with self._lock:
+            return self._value, self._fetched_at
 
 
 class Heap(Enum):
@@ -84,90 +269,263 @@ class RequestsCount(Enum):
     TOTAL = "total"
 
 
+def _scalar_metric_specs() -> dict[str, tuple[str, str, tuple[str, ...], str]]:
+    """Build the table describing every scalar metric exposed by the exporter.
+
+    Each entry maps the metric name suffix to its full prometheus name, its documentation, the
+    path of the parent dictionary inside the API response and the key holding the value in that
+    parent. The table is built once at import so no name or documentation string is recomputed
+    at scrape time.
+
+    Returns:
+        dict[str, tuple[str, str, tuple[str, ...], str]]: suffix to (name, doc, parent path,
+        key) table.
+    """
+    specs: dict[str, tuple[str, tuple[str, ...], str]] = {
+        "current_connections": (
+            "OpenSearch dashboards number of concurrent connections",
+            ("metrics",),
+            "concurrent_connections",
+        ),
+        "up_time": (
+            "OpenSearch dashboards up time in milliseconds",
+            ("metrics", "process"),
+            "uptime_in_millis",
+        ),
+        "event_loop_delay": (
+            "Opensearch dashboards event loop delay in milliseconds",
+            ("metrics", "process"),
+            "event_loop_delay",
+        ),
+        "re_set_size": (
+            "Opensearch dashboards resident set size in bytes",
+            ("metrics", "process", "memory"),
+            "resident_set_size_in_bytes",
+        ),
+    }
+    for heap in Heap:
+        prefix = heap.value.split("_")[0]
+        specs[f"heap_{prefix}"] = (
+            f"Opensearch dashboards memory heap {prefix} in bytes",
+            ("metrics", "process", "memory", "heap"),
+            heap.value,
+        )
+    for load in Load:
+        specs[f"load_{load.value}"] = (
+            f"OpenSearch dashboards load average {load.value}",
+            ("metrics", "os", "load"),
+            load.value,
+        )
+    for memory in Memory:
+        prefix = memory.value.split("_")[0]
+        specs[f"os_mem_{prefix}"] = (
+            f"OpenSearch dashboards memory {prefix} in bytes",
+            ("metrics", "os", "memory"),
+            memory.value,
+        )
+    for response in Response:
+        prefix = response.value.split("_")[0]
+        specs[f"resp_time_{prefix}"] = (
+            f"OpenSearch dashboards {prefix} response time in milliseconds",
+            ("metrics", "response_times"),
+            response.value,
+        )
+    for req in RequestsCount:
+        specs[f"req_{req.value}"] = (
+            f"OpenSearch dashboards request {req.value} count",
+            ("metrics", "requests"),
+            req.value,
+        )
+    return {
+        suffix: (f"{METRICS_PREFIX}{suffix}", doc, parent_path, key)
+        for suffix, (doc, parent_path, key) in specs.items()
+    }
+
+
+_SCALAR_METRIC_SPECS = _scalar_metric_specs()
+
+# enum member to metric name suffix, precomputed so the per-metric helpers do not redo the
+# split and formatting work on every call
+_ENUM_SUFFIX: dict[Enum, str] = {
+    **{heap: f"heap_{heap.value.split('_')[0]}" for heap in Heap},
+    **{load: f"load_{load.value}" for load in Load},
+    **{memory: f"os_mem_{memory.value.split('_')[0]}" for memory in Memory},
+    **{response: f"resp_time_{response.value.split('_')[0]}" for response in Response},
+    **{req: f"req_{req.value}" for req in RequestsCount},
+}
+_STATUS_METRIC_NAME = f"{METRICS_PREFIX}status"
+_STATUSES_METRIC_NAME = f"{METRICS_PREFIX}statuses"
+
+# health of the cluster or plugins as a number, matching the OpenSearch exporter behavior
+_STATE_VALUE = {"green": 0.0, "yellow": 1.0, "red": 2.0}
+
+# label keys of the statuses rows, cached on first observation since the upstream schema
+# fixes them for every row
+_STATUSES_LABEL_KEYS: tuple[str, ...] = ()
+
+
+def _status_label_keys(status_labels: dict) -> tuple[str, ...]:
+    """Get the label keys of a status row, reusing the cached tuple while the schema holds.
+
+    Args:
+        status_labels (dict): Labels of one status row from the API
+
+    Returns:
+        tuple[str, ...]: Label keys of the row
+    """
+    global _STATUSES_LABEL_KEYS  # pylint: disable=global-statement
+    cached = _STATUSES_LABEL_KEYS
+    if len(cached) != len(status_labels) or any(key not in status_labels for key in cached):
+        cached = tuple(status_labels)
+        _STATUSES_LABEL_KEYS = cached
+    return cached
+
+
 class DashboardsCollector(Collector):
     """OpenSearch Dashboards Collector"""
 
     def __init__(self, config: Config) -> None:
         super().__init__()
         self.config = config
+        self._cache = _MetricsCache()
+        if config.ca_bundle:
+            _SESSION.verify = config.ca_bundle
+        if config.refresh_interval > 0:
+            threading.Thread(target=self._refresh_loop, daemon=True).start()
+
+    def _refresh_loop(self) -> None:
+        """Poll the API forever, refreshing the cache served to scrapes."""
+        while True:
+            # one bad response must not kill the daemon thread, or the exporter would
+            # silently serve the stale cache forever
+            try:
+                self._cache.update(_prune_api_response(collect_api_status(self.config)))
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Unexpected error while refreshing the metrics cache")
+            time.sleep(self.config.refresh_interval)
 
     def collect(self) -> Generator[Metric, None, None]:
         """Collect all the metrics from /api/status to be exported.
 
+        When a background refresher is running, the cached response is served so scrapes never
+        wait on the upstream API.
+
         Yields:
             Generator[Metric]: the internal status metrics of status
         """
-        api_metrics = collect_api_status(self.config)
+        cache_age = None
+        if self.config.refresh_interval > 0:
+            api_metrics, fetched_at = self._cache.get()
+            # before the first refresh lands fetched_at is 0.0 and the age would be the raw
+            # monotonic clock, so the gauge is suppressed until there is a fetch to age
+            if fetched_at:
+                cache_age = GaugeMetricFamily(
+                    name=f"{METRICS_PREFIX}cache_age_seconds",
+                    documentation="Seconds since the cached API response was last refreshed",
+                    value=time.monotonic() - fetched_at,
+                )
+        else:
+            api_metrics = collect_api_status(self.config)
         api_up = GaugeMetricFamily(
             name=f"{METRICS_PREFIX}up",
             documentation="Whether the data source is reachable (1 for up, 0 for down)",
             value=1 if api_metrics else 0,
         )
         yield api_up
+        if cache_age is not None:
+            yield cache_age
 
-        for description, value in self.metrics(api_metrics):
-            if value:
-                yield value
-            else:
-                logger.error("Could not get the metric: %s", description)
+        # when the API is unreachable there is nothing to build beyond the up gauge
+        if not api_metrics:
+            return
+
+        yield from self.metrics(api_metrics)
+
+    def render_text(self) -> bytes:
+        """Render every collected metric in the prometheus text exposition format.
+
+        This is a specialized writer for the exporter's fixed gauge-only schema: it formats
+        the samples straight into a bytearray instead of going through the generic registry
+        walk of the prometheus client.
 
-    def metrics(self, api_metrics: dict[str, Any]) -> list[tuple[str, Optional[Metric]]]:
+        Returns:
+            bytes: Scrape response body in the text exposition format
+        """
+        buffer = bytearray()
+        for metric in self.collect():
+            buffer += _exposition_header(metric.name, metric.documentation)
+            for sample in metric.samples:
+                _render_sample(buffer, sample.name, sample.labels, sample.value)
+        return bytes(buffer)
+
+    def metrics(self, api_metrics: dict[str, Any]) -> Generator[Metric, None, None]:
         """Get the OpenSearch dashboard prometheus metrics.
 
+        Metrics missing from the API response are logged and skipped, so only buildable
+        gauges are yielded and no intermediate list is materialized per scrape.
+
         Args:
             api_metrics (dict): Metrics from the OpenSearch Dashboards API
 
-        Returns:
-            list[tuple[str, Optional[Metric]]]: Prometheus Gauge metrics of the dashboards
+        Yields:
+            Generator[Metric]: Prometheus Gauge metrics of the dashboards
         """
         if not api_metrics:
-            return []
-        return [
-            ("status", _get_overall_status_metric(api_metrics)),
-            ("current_connections", _get_current_connections_metric(api_metrics)),
-            ("up_time", _get_up_time_metric(api_metrics)),
-            ("event_loop_delay", _get_event_loop_delay_metric(api_metrics)),
-            ("heap_total", _get_heap(api_metrics, Heap.TOTAL)),
-            ("heap_used", _get_heap(api_metrics, Heap.USED)),
-            ("heap_size", _get_heap(api_metrics, Heap.SIZE)),
-            ("re_set_size", _get_resident_set_size(api_metrics)),
-            ("load_1m", _get_load(api_metrics, Load.ONE_M)),
-            ("load_5m", _get_load(api_metrics, Load.FIVE_M)),
-            ("load_15m", _get_load(api_metrics, Load.FIFTEEN_M)),
-            ("os_mem_total", _get_os_mem(api_metrics, Memory.TOTAL)),
-            ("os_mem_free", _get_os_mem(api_metrics, Memory.FREE)),
-            ("os_mem_used", _get_os_mem(api_metrics, Memory.USED)),
-            ("resp_time_avg", _get_resp_time(api_metrics, Response.AVG)),
-            ("resp_time_max", _get_resp_time(api_metrics, Response.MAX)),
-            ("req_disconnects", _get_req(api_metrics, RequestsCount.DISCONNECTS)),
-            ("req_total", _get_req(api_metrics, RequestsCount.TOTAL)),
-        ] + [("statuses", status) for status in _get_statuses_metrics(api_metrics)]
+            return
+        for description, value in _build_all_metrics(api_metrics):
+            if value is not None:
+                yield value
+            else:
+                logger.error("Could not get the metric: %s", description)
+
+
+_SINGLE_FLIGHT = _SingleFlight()
+
+# last successful API response and the monotonic time it was fetched, used by the TTL cache
+_TTL_CACHE: Optional[tuple[float, dict[str, Any]]] = None
 
 
 def collect_api_status(config: Config) -> dict[str, Any]:
     """Use the dashboard API to get the status of the dashboard.
 
+    Concurrent callers are coalesced so a burst of scrapes results in a single request
+    against the upstream API, and when config.cache_ttl is set the last successful response
+    is reused until it expires.
+
+    Args:
+        config (Config): Config necessary to access the information.
+
+    Returns:
+        dict: Raw response from the API
+    """
+    global _TTL_CACHE  # pylint: disable=global-statement
+    if config.cache_ttl > 0:
+        cached = _TTL_CACHE
+        if cached is not None and time.monotonic() - cached[0] < config.cache_ttl:
+            return cached[1]
+    result = _SINGLE_FLIGHT.fetch(lambda: _fetch_api_status(config))
+    if config.cache_ttl > 0 and result:
+        _TTL_CACHE = (time.monotonic(), result)
+    return result
+
+
+def _fetch_api_status(config: Config) -> dict[str, Any]:
+    """Perform the HTTP request against the dashboard status API.
+
     Args:
         config (Config): Config necessary to access the information.
 
     Returns:
         dict: Raw response from the API
     """
-    auth = HTTPBasicAuth(config.user, config.password)
-    headers = {"Accept": "application/json"}
+    headers = _request_headers(config.user, config.password)
     url = f"{config.url}{API_STATUS_ENDPOINT}"
 
     try:
-        with requests.Session() as session:
-            response = session.get(
-                url,
-                auth=auth,
-                verify=False,
-                headers=headers,
-                timeout=5,
-            )
+        response = _SESSION.get(url, headers=headers, timeout=_REQUEST_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        # parse the raw bytes directly, skipping the charset detection done by response.json()
+        return _json_loads(response.content)
     except HTTPError as e:
         logger.error(
             "Request to %s status code: %s response text %s.",
@@ -179,10 +537,148 @@ def collect_api_status(config: Config) -> dict[str, Any]:
         logger.error("Request to %s timed out.", url)
     except RequestException as e:
         logger.error("It was not possible to collect the OpenSearch Dashboards metrics %s", e)
+    except ValueError as e:
+        # both orjson and the stdlib raise ValueError subclasses on malformed bodies, e.g. a
+        # proxy answering with an HTML page; response.json() used to wrap this in a
+        # RequestException
+        logger.error("Response from %s is not valid JSON: %s", url, e)
 
     return {}
 
 
+@lru_cache(maxsize=64)
+def _exposition_header(name: str, documentation: str) -> bytes:
+    """Build the HELP and TYPE comment lines of a gauge metric.
+
+    The lines are static per metric, so they are encoded once and cached across scrapes.
+
+    Args:
+        name (str): Full name of the prometheus metric
+        documentation (str): Documentation of the metric
+
+    Returns:
+        bytes: Encoded HELP and TYPE lines of the metric
+    """
+    return f"# HELP {name} {documentation}\n# TYPE {name} gauge\n".encode()
+
+
+def _render_sample(buffer: bytearray, name: str, labels: dict[str, str], value: float) -> None:
+    """Append one sample line in the text exposition format to the buffer.
+
+    Args:
+        buffer (bytearray): Buffer holding the scrape response being built
+        name (str): Full name of the prometheus metric
+        labels (dict[str, str]): Labels of the sample, may be empty
+        value (float): Value of the sample
+    """
+    if labels:
+        label_text = ",".join(
+            '{}="{}"'.format(
+                key, str(label).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+            )
+            for key, label in labels.items()
+        )
+        buffer += f"{name}{{{label_text}}} {floatToGoString(value)}\n".encode()
+    else:
+        buffer += f"{name} {floatToGoString(value)}\n".encode()
+
+
+def _prune_api_response(api_metrics: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the subtrees of the API response the exporter reads.
+
+    The status endpoint also returns version and ephemeral identification blobs the exporter
+    never exposes; dropping them keeps the cached response proportional to the metrics that
+    are actually served.
+
+    Args:
+        api_metrics (dict): Raw response from the API
+
+    Returns:
+        dict[str, Any]: Response reduced to the status and metrics subtrees
+    """
+    if not api_metrics:
+        return api_metrics
+    return {key: api_metrics[key] for key in ("status", "metrics") if key in api_metrics}
+
+
+def _walk(api_metrics: dict, path: tuple[str, ...]) -> Optional[Any]:
+    """Descend into the API response following a path of keys.
+
+    Args:
+        api_metrics (dict): Response from the API
+        path (tuple[str, ...]): Keys to follow, one per nesting level
+
+    Returns:
+        Optional[Any]: The value at the end of the path or None if any level is missing
+    """
+    node: Any = api_metrics
+    for key in path:
+        if not isinstance(node, Mapping):
+            return None
+        node = node.get(key)
+    return node
+
+
+def _make_scalar_gauge(parent: Any, name: str, doc: str, key: str) -> Optional[Metric]:
+    """Build a gauge for a single scalar value of the API response.
+
+    Args:
+        parent (Any): Parent dictionary holding the value, or None if it was missing
+        name (str): Full name of the prometheus metric
+        doc (str): Documentation of the metric
+        key (str): Key holding the value in the parent dictionary
+
+    Returns:
+        Optional[Metric]: Prometheus Gauge metric if the value exists in the API
+    """
+    if not isinstance(parent, Mapping) or key not in parent:
+        return None
+    return GaugeMetricFamily(
+        name=name,
+        documentation=doc,
+        value=parent[key],
+    )
+
+
+def _scalar_metric(api_metrics: dict, suffix: str) -> Optional[Metric]:
+    """Get a single scalar metric described by the specs table.
+
+    Args:
+        api_metrics (dict): Response from the API
+        suffix (str): Metric name suffix identifying the entry in the specs table
+
+    Returns:
+        Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
+    """
+    name, doc, parent_path, key = _SCALAR_METRIC_SPECS[suffix]
+    return _make_scalar_gauge(_walk(api_metrics, parent_path), name, doc, key)
+
+
+def _build_all_metrics(
+    api_metrics: dict,
+) -> Generator[tuple[str, Optional[Metric]], None, None]:
+    """Build every exposed metric walking the API response a single time.
+
+    The parent dictionaries shared by several metrics (e.g. the heap or load sub-dicts) are
+    resolved once and reused, instead of re-traversing the full response per metric.
+
+    Args:
+        api_metrics (dict): Response from the API
+
+    Yields:
+        Generator[tuple[str, Optional[Metric]]]: description and Prometheus Gauge metric (or
+        None when missing from the API) of the dashboards
+    """
+    parents: dict[tuple[str, ...], Any] = {}
+    yield "status", _get_overall_status_metric(api_metrics)
+    for suffix, (name, doc, parent_path, key) in _SCALAR_METRIC_SPECS.items():
+        if parent_path not in parents:
+            parents[parent_path] = _walk(api_metrics, parent_path)
+        yield suffix, _make_scalar_gauge(parents[parent_path], name, doc, key)
+    for status in _get_statuses_metrics(api_metrics):
+        yield "statuses", status
+
+
 def _get_overall_status_metric(api_metrics: dict) -> Optional[Metric]:
     """Get the overall status of the dashboards.
 
@@ -192,21 +688,19 @@ def _get_overall_status_metric(api_metrics: dict) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    metric_name = f"{METRICS_PREFIX}status"
-    match api_metrics:
-        case {"status": {"overall": value}}:
-            overall_status_metric = GaugeMetricFamily(
-                name=metric_name,
-                documentation="General state of the dashboards cluster",
-                labels=value.keys(),
-            )
-            overall_status_metric.add_metric(list(value.values()), _get_status_value(value))
-            return overall_status_metric
-        case _:
-            return None
+    value = _walk(api_metrics, ("status", "overall"))
+    if not isinstance(value, Mapping):
+        return None
+    overall_status_metric = GaugeMetricFamily(
+        name=_STATUS_METRIC_NAME,
+        documentation="General state of the dashboards cluster",
+        labels=list(value.keys()),
+    )
+    overall_status_metric.add_metric(list(value.values()), _get_status_value(value))
+    return overall_status_metric
 
 
-def _get_status_value(status: dict[str, str]) -> float:
+def _get_status_value(status: Mapping[str, str]) -> float:
     """Get the status from the dashboard depending on the color.
 
     If the cluster is green, it will return 0
@@ -217,20 +711,12 @@ def _get_status_value(status: dict[str, str]) -> float:
     Note that this output value is to match the same behavior from the OpenSearch exporter.
 
     Args:
-        status (dict[str, str]): Status of the health of the cluster or plugins
+        status (Mapping[str, str]): Status of the health of the cluster or plugins
 
     Returns:
         float: status as a number representing the health.
     """
-    match status:
-        case {"state": "green"}:
-            return 0
-        case {"state": "yellow"}:
-            return 1
-        case {"state": "red"}:
-            return 2
-        case _:
-            return -1
+    return _STATE_VALUE.get(status.get("state", ""), -1.0)
 
 
 def _get_statuses_metrics(api_metrics: dict) -> Sequence[Metric]:
@@ -242,25 +728,22 @@ def _get_statuses_metrics(api_metrics: dict) -> Sequence[Metric]:
     Returns:
         Sequence[Metric]: Prometheus Gauge metrics if the statuses exist in the API
     """
-    metric_name = f"{METRICS_PREFIX}statuses"
-    statuses_metrics = []
-    match api_metrics:
-        case {"status": {"statuses": statuses}}:
-            for status_labels in statuses:
-                overall_status_metric = GaugeMetricFamily(
-                    name=metric_name,
-                    documentation=(
-                        "OpenSearch dashboards granular state of plugins and core components"
-                    ),
-                    labels=status_labels.keys(),
-                )
-                overall_status_metric.add_metric(
-                    status_labels.values(), _get_status_value(status_labels)
-                )
-                statuses_metrics.append(overall_status_metric)
-            return statuses_metrics
-        case _:
-            return statuses_metrics
+    statuses_metrics: list[Metric] = []
+    statuses = _walk(api_metrics, ("status", "statuses"))
+    if not isinstance(statuses, list):
+        return statuses_metrics
+    for status_labels in statuses:
+        label_keys = _status_label_keys(status_labels)
+        overall_status_metric = GaugeMetricFamily(
+            name=_STATUSES_METRIC_NAME,
+            documentation="OpenSearch dashboards granular state of plugins and core components",
+            labels=label_keys,
+        )
+        overall_status_metric.add_metric(
+            [status_labels[key] for key in label_keys], _get_status_value(status_labels)
+        )
+        statuses_metrics.append(overall_status_metric)
+    return statuses_metrics
 
 
 def _get_current_connections_metric(api_metrics: dict) -> Optional[Metric]:
@@ -272,16 +755,7 @@ def _get_current_connections_metric(api_metrics: dict) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    metric_name = f"{METRICS_PREFIX}current_connections"
-    match api_metrics:
-        case {"metrics": {"concurrent_connections": value}}:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation="OpenSearch dashboards number of concurrent connections",
-                value=value,
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, "current_connections")
 
 
 def _get_up_time_metric(api_metrics: dict) -> Optional[Metric]:
@@ -293,16 +767,7 @@ def _get_up_time_metric(api_metrics: dict) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    metric_name = f"{METRICS_PREFIX}up_time"
-    match api_metrics:
-        case {"metrics": {"process": {"uptime_in_millis": value}}}:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation="OpenSearch dashboards up time in milliseconds",
-                value=value,
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, "up_time")
 
 
 def _get_event_loop_delay_metric(api_metrics: dict) -> Optional[Metric]:
@@ -314,16 +779,7 @@ def _get_event_loop_delay_metric(api_metrics: dict) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    metric_name = f"{METRICS_PREFIX}event_loop_delay"
-    match api_metrics:
-        case {"metrics": {"process": {"event_loop_delay": value}}}:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation="Opensearch dashboards event loop delay in milliseconds",
-                value=value,
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, "event_loop_delay")
 
 
 def _get_resident_set_size(api_metrics: dict) -> Optional[Metric]:
@@ -335,16 +791,7 @@ def _get_resident_set_size(api_metrics: dict) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    metric_name = f"{METRICS_PREFIX}re_set_size"
-    match api_metrics:
-        case {"metrics": {"process": {"memory": {"resident_set_size_in_bytes": value}}}}:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation="Opensearch dashboards resident set size in bytes",
-                value=value,
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, "re_set_size")
 
 
 def _get_heap(api_metrics: dict, heap: Heap) -> Optional[Metric]:
@@ -357,20 +804,7 @@ def _get_heap(api_metrics: dict, heap: Heap) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    heap_value = heap.value
-    prefix = heap_value.split("_")[0]
-    metric_name = f"{METRICS_PREFIX}heap_{prefix}"
-    match api_metrics:
-        case {
-            "metrics": {"process": {"memory": {"heap": heap_values}}}
-        } if heap_value in heap_values:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation=f"Opensearch dashboards memory heap {prefix} in bytes",
-                value=heap_values[heap_value],
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, _ENUM_SUFFIX[heap])
 
 
 def _get_load(api_metrics: dict, load: Load) -> Optional[Metric]:
@@ -383,17 +817,7 @@ def _get_load(api_metrics: dict, load: Load) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    load_value = load.value
-    metric_name = f"{METRICS_PREFIX}load_{load_value}"
-    match api_metrics:
-        case {"metrics": {"os": {"load": load_values}}} if load_value in load_values:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation=f"OpenSearch dashboards load average {load_value}",
-                value=load_values[load_value],
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, _ENUM_SUFFIX[load])
 
 
 def _get_os_mem(api_metrics: dict, memory: Memory) -> Optional[Metric]:
@@ -406,18 +830,7 @@ def _get_os_mem(api_metrics: dict, memory: Memory) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    mem_value = memory.value
-    prefix = mem_value.split("_")[0]
-    metric_name = f"{METRICS_PREFIX}os_mem_{prefix}"
-    match api_metrics:
-        case {"metrics": {"os": {"memory": mem_values}}} if mem_value in mem_values:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation=f"OpenSearch dashboards memory {prefix} in bytes",
-                value=mem_values[mem_value],
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, _ENUM_SUFFIX[memory])
 
 
 def _get_resp_time(api_metrics: dict, response: Response) -> Optional[Metric]:
@@ -430,18 +843,7 @@ def _get_resp_time(api_metrics: dict, response: Response) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    response_value = response.value
-    prefix = response_value.split("_")[0]
-    metric_name = f"{METRICS_PREFIX}resp_time_{prefix}"
-    match api_metrics:
-        case {"metrics": {"response_times": response_values}} if response_value in response_values:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation=f"OpenSearch dashboards {prefix} response time in milliseconds",
-                value=response_values[response_value],
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, _ENUM_SUFFIX[response])
 
 
 def _get_req(api_metrics: dict, req: RequestsCount) -> Optional[Metric]:
@@ -454,14 +856,4 @@ def _get_req(api_metrics: dict, req: RequestsCount) -> Optional[Metric]:
     Returns:
         Optional[Metric]: Prometheus Gauge metric if the metric exist in the API
     """
-    requests_value = req.value
-    metric_name = f"{METRICS_PREFIX}req_{requests_value}"
-    match api_metrics:
-        case {"metrics": {"requests": requests_values}} if requests_value in requests_values:
-            return GaugeMetricFamily(
-                name=metric_name,
-                documentation=f"OpenSearch dashboards request {requests_value} count",
-                value=requests_values[requests_value],
-            )
-        case _:
-            return None
+    return _scalar_metric(api_metrics, _ENUM_SUFFIX[req])
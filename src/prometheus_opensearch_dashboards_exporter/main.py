@@ -7,10 +7,17 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Any, Iterable
-from wsgiref.simple_server import make_server
-
-from prometheus_client import make_wsgi_app
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Iterable, Optional
+from wsgiref.simple_server import WSGIServer, make_server
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    GC_COLLECTOR,
+    PLATFORM_COLLECTOR,
+    PROCESS_COLLECTOR,
+    make_wsgi_app,
+)
 from prometheus_client.core import REGISTRY
 
 from prometheus_opensearch_dashboards_exporter.collector import (
@@ -18,11 +25,63 @@ from prometheus_opensearch_dashboards_exporter.collector import (
     DashboardsCollector,
 )
 
-APP = make_wsgi_app()
+# declared Optional up front so mypy keeps the stdlib fallback reachable whether or not
+# the waitress stubs are installed
+_waitress_serve: Optional[Callable[..., Any]]
+try:  # pragma: no cover
+    # waitress (python3-waitress in the Ubuntu archive) is a production WSGI server with a
+    # thread pool and connection keep-alive; the stdlib server stays as a fallback when it
+    # is not installed.
+    from waitress import serve as _waitress_serve
+except ImportError:  # pragma: no cover
+    _waitress_serve = None
+
+# generic prometheus client WSGI app, built lazily on the first scrape that needs it (the
+# fast path renders directly from the collector and never pays for it)
+APP: Optional[Callable[[dict[str, Any], Any], Iterable[bytes]]] = None
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server that handles each request in its own thread.
+
+    A slow scrape no longer blocks the landing page or concurrent scrapes, since the
+    default wsgiref server processes requests one at a time.
+    """
+
+    daemon_threads = True
+
+
+# collector used by the fast /metrics path, set at startup by main()
+_COLLECTOR: Optional[DashboardsCollector] = None
+
+_INDEX_HTML_PATH = Path(__file__).parent / "index.html"
+
+# landing page read once at import; None when the file is missing from the installation
+_INDEX_HTML: Optional[bytes] = _INDEX_HTML_PATH.read_bytes() if _INDEX_HTML_PATH.exists() else None
+
+# static responses built once instead of per request; headers are tuples because wsgiref
+# appends Content-Length to the list handed to start_response, so each call gets a fresh list
+_HTML_HEADERS = (("Content-Type", "text/html"),)
+_PLAIN_HEADERS = (("Content-Type", "text/plain"),)
+_NOT_FOUND_BODY = [b"404 Not Found"]
+_MISSING_HTML_BODY = [b"500 HTML Page Not Found"]
+
+
+def _set_collector(dashboards_collector: Optional[DashboardsCollector]) -> None:
+    """Set the collector used to render /metrics without going through the registry.
+
+    Args:
+        dashboards_collector (Optional[DashboardsCollector]): Collector of the exporter or
+        None to fall back to the prometheus client WSGI app
+    """
+    global _COLLECTOR  # pylint: disable=global-statement
+    _COLLECTOR = dashboards_collector
 
 
 def setup_logging() -> None:
-    """Setup the log for the application."""
+    """Setup the log for the application, once per process."""
+    if logging.getLogger().handlers:
+        return
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(levelname)s - %(message)s",
@@ -55,10 +114,92 @@ def parse_command_line(args: list[str]) -> argparse.Namespace:
         default=9684,
         help="The port number to the prometheus exporter to use (default: 9684)",
     )
+    parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=15.0,
+        help=(
+            "Interval in seconds between background refreshes of the OpenSearch Dashboards "
+            "metrics. 0 disables the background refresher and fetches on every scrape "
+            "(default: 15)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=5.0,
+        help=(
+            "Seconds to reuse the last successful OpenSearch Dashboards response before "
+            "fetching again. 0 disables the cache (default: 5)"
+        ),
+    )
+    parser.add_argument(
+        "--ca-bundle",
+        type=str,
+        default=None,
+        help=(
+            "Path to a CA bundle used to verify the OpenSearch Dashboards TLS certificate. "
+            "When omitted, certificates are not verified"
+        ),
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Number of threads serving HTTP requests when waitress is available (default: 4)",
+    )
 
     return parser.parse_args(args)
 
 
+def _serve_metrics(environ: dict[str, Any], start_response: Any) -> Iterable[bytes]:
+    """Serve the /metrics path.
+
+    Args:
+        environ (dict[str, Any]): environment variable defined by the WSGI specification
+        start_response (Any): Function that is provided by the WSGI server
+        and is used by the WSGI application to start the HTTP response
+
+    Returns:
+        Iterable[bytes]: prometheus metrics in the text exposition format
+    """
+    # render directly unless the scraper negotiates OpenMetrics, which only the generic
+    # prometheus client app can produce
+    global APP  # pylint: disable=global-statement
+    if _COLLECTOR is not None and "openmetrics" not in environ.get("HTTP_ACCEPT", ""):
+        start_response("200 OK", [("Content-Type", CONTENT_TYPE_LATEST)])
+        return [_COLLECTOR.render_text()]
+    if APP is None:
+        APP = make_wsgi_app()
+    return APP(environ, start_response)
+
+
+def _serve_index(_: dict[str, Any], start_response: Any) -> Iterable[bytes]:
+    """Serve the landing page at /.
+
+    Args:
+        _ (dict[str, Any]): environment variable defined by the WSGI specification
+        start_response (Any): Function that is provided by the WSGI server
+        and is used by the WSGI application to start the HTTP response
+
+    Returns:
+        Iterable[bytes]: landing page or a 500 error when index.html is missing
+    """
+    if _INDEX_HTML is not None:
+        start_response("200 OK", list(_HTML_HEADERS))
+        return [_INDEX_HTML]
+
+    start_response("500 Internal Error", list(_PLAIN_HEADERS))
+    return _MISSING_HTML_BODY
+
+
+# route dispatch table so the hot path costs a single dict lookup
+_HANDLERS: dict[str, Callable[[dict[str, Any], Any], Iterable[bytes]]] = {
+    "/metrics": _serve_metrics,
+    "/": _serve_index,
+}
+
+
 def metrics_app(environ: dict[str, Any], start_response: Any) -> Iterable[bytes]:
     """Create the WSGI app to respond at the /metrics path
 
@@ -72,22 +213,12 @@ def metrics_app(environ: dict[str, Any], start_response: Any) -> Iterable[bytes]
         Iterable[bytes]: Response of the request. In the case prometheus metrics at /metrics and
         404 Not found for other paths
     """
-    path: str = environ.get("PATH_INFO", "")
-
-    if path == "/metrics":
-        return APP(environ, start_response)
+    handler = _HANDLERS.get(environ.get("PATH_INFO", ""))
+    if handler is not None:
+        return handler(environ, start_response)
 
-    if path == "/":
-        html_file_path = Path(__file__).parent / "index.html"
-        if html_file_path.exists():
-            start_response("200 OK", [("Content-Type", "text/html")])
-            return [html_file_path.read_bytes()]
-
-        start_response("500 Internal Error", [("Content-Type", "text/plain")])
-        return [b"500 HTML Page Not Found"]
-
-    start_response("404 Not Found", [("Content-Type", "text/plain")])
-    return [b"404 Not Found"]
+    start_response("404 Not Found", list(_PLAIN_HEADERS))
+    return _NOT_FOUND_BODY
 
 
 def main() -> None:
@@ -97,9 +228,26 @@ def main() -> None:
     user = os.getenv("OPENSEARCH_DASHBOARDS_USER", "")
     password = os.getenv("OPENSEARCH_DASHBOARDS_PASSWORD", "")
 
-    config = Config(args.url, user, password)
-    REGISTRY.register(DashboardsCollector(config))
-    with make_server("", args.port, metrics_app) as httpd:
+    config = Config(
+        args.url,
+        user,
+        password,
+        refresh_interval=args.refresh_interval,
+        cache_ttl=args.cache_ttl,
+        ca_bundle=args.ca_bundle,
+    )
+    dashboards_collector = DashboardsCollector(config)
+    # the fast /metrics path renders only this exporter's collector, so drop the default
+    # platform/process/gc collectors from the registry to keep the generic app (used when
+    # OpenMetrics is negotiated) exposing the same metric families
+    for default_collector in (GC_COLLECTOR, PLATFORM_COLLECTOR, PROCESS_COLLECTOR):
+        REGISTRY.unregister(default_collector)
+    REGISTRY.register(dashboards_collector)
+    _set_collector(dashboards_collector)
+    if _waitress_serve is not None:
+        _waitress_serve(metrics_app, host="0.0.0.0", port=args.port, threads=args.threads)
+        return
+    with make_server("", args.port, metrics_app, server_class=_ThreadingWSGIServer) as httpd:
         httpd.serve_forever()
 
 
@@ -2,18 +2,28 @@
 # See LICENSE file for licensing details.
 """Fixtures for tests"""
 
-import json
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # keep the test environment portable: orjson is an optional speed-up, mirroring the
+    # fallback in the collector itself
+    from json import loads as _json_loads
 
-@pytest.fixture
-def api_response():
-    current_dir = Path(__file__).parent
-    json_file_path = current_dir / "dashboard_response.json"
 
-    with open(json_file_path, "r") as f:
-        data = json.load(f)
+@lru_cache(maxsize=1)
+def _load_dashboard_json():
+    # parsed once per process; the read-only proxy forces tests that need to mutate the
+    # response to copy it explicitly, so sharing the fixture cannot leak state between tests
+    json_file_path = Path(__file__).parent / "dashboard_response.json"
+    return MappingProxyType(_json_loads(json_file_path.read_bytes()))
+
 
-    return data
+@pytest.fixture(scope="session")
+def api_response():
+    return _load_dashboard_json()
@@ -2,14 +2,18 @@
 # See LICENSE file for licensing details.
 
 import json
+import socket
 import subprocess
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
+import requests
 
+from prometheus_opensearch_dashboards_exporter import main
 from prometheus_opensearch_dashboards_exporter.collector import (
+    _SCALAR_METRIC_SPECS,
     API_STATUS_ENDPOINT,
     METRICS_PREFIX,
     Config,
@@ -17,68 +21,117 @@ from prometheus_opensearch_dashboards_exporter.collector import (
 )
 
 
-@pytest.fixture
+def _wait_ready(port: int, timeout: float = 5.0) -> None:
+    # poll until the exporter accepts connections instead of sleeping a fixed amount
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.025)
+    raise TimeoutError(f"server did not start listening on port {port}")
+
+
+@pytest.fixture(scope="session")
 def mock_opensearch_api_handler(api_response):
+    # serialize the canned responses once per session instead of on every GET
+    status_body = json.dumps(dict(api_response)).encode("utf-8")
+    error_body = json.dumps({"error": "Unknown endpoint"}).encode("utf-8")
+
     class MockOpenSearchAPIHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 enables connection keep-alive between the exporter and the mock
+        protocol_version = "HTTP/1.1"
+        # fully buffer the response so headers and body leave in a single socket write
+        wbufsize = -1
+
         def do_GET(self):  # noqa: N802
-            if self.path == API_STATUS_ENDPOINT:
-                response = api_response
-            else:
-                response = {"error": "Unknown endpoint"}
+            known_path = self.path == API_STATUS_ENDPOINT
+            body = status_body if known_path else error_body
 
-            self.send_response(200 if self.path == API_STATUS_ENDPOINT else 404)
+            self.send_response(200 if known_path else 404)
             self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
             self.end_headers()
-            self.wfile.write(json.dumps(response).encode("utf-8"))
+            self.wfile.write(body)
 
     return MockOpenSearchAPIHandler
 
 
-@pytest.fixture
+def _free_port() -> int:
+    # let the OS hand out an unused port so parallel workers never collide
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
 def start_mock_server(mock_opensearch_api_handler):
-    server = HTTPServer(("localhost", 5601), mock_opensearch_api_handler)
+    # port 0 binds an ephemeral port; consumers read it back from the server address
+    server = ThreadingHTTPServer(("localhost", 0), mock_opensearch_api_handler)
     thread = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
     yield server
     server.shutdown()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def prometheus_exporter(start_mock_server):
-    # Start the Prometheus exporter
-    process = subprocess.Popen(
-        ["python3", "src/prometheus_opensearch_dashboards_exporter/main.py"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+    # Serve the real WSGI app in-process instead of spawning an interpreter per test
+    # the direct render path is used, so the collector does not need to join the global
+    # registry (unregistering it cleanly is not possible anyway: the statuses family exposes
+    # one metric per plugin under the same name)
+    config = Config(f"http://localhost:{start_mock_server.server_address[1]}", "", "")
+    dashboards_collector = DashboardsCollector(config)
+    main._set_collector(dashboards_collector)
+    server = main.make_server(
+        "localhost", 0, main.metrics_app, server_class=main._ThreadingWSGIServer
     )
-    # Allow some time for the exporter to start
-    time.sleep(2)
-    yield process
-    process.terminate()
-    process.wait()
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _wait_ready(port)
+    yield f"http://localhost:{port}"
+    server.shutdown()
+    main._set_collector(None)
 
 
 @pytest.fixture
 def wrong_prometheus_exporter(start_mock_server):
-    # Start a wrong Prometheus exporter that won't be able to query because of tls
+    # Start a wrong Prometheus exporter that won't be able to query because of tls.
+    # It listens on its own port so it can coexist with the session-scoped exporter.
+    port = _free_port()
     process = subprocess.Popen(
         [
             "python3",
             "src/prometheus_opensearch_dashboards_exporter/main.py",
             "--url",
-            "https://localhost:5601",
+            f"https://localhost:{start_mock_server.server_address[1]}",
+            "--port",
+            str(port),
         ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        # no test reads the output; piping it could fill the OS buffer and block the exporter
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
-    # Allow some time for the exporter to start
-    time.sleep(2)
-    yield process
+    _wait_ready(port)
+    yield f"http://localhost:{port}"
     process.terminate()
     process.wait()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def http_session():
+    # one pooled session for the whole suite so requests reuse kept-alive connections
+    session = requests.Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
 def expected_metrics():
-    metrics = DashboardsCollector(Config("", "", "")).metrics({"foo": "bar"})
-    return {f"{METRICS_PREFIX}{metric[0]}" for metric in metrics}
+    metric_names = {spec[0] for spec in _SCALAR_METRIC_SPECS.values()}
+    metric_names.add(f"{METRICS_PREFIX}status")
+    metric_names.add(f"{METRICS_PREFIX}statuses")
+    # frozen so the shared fixture cannot be mutated by one test and leak into another
+    return frozenset(metric_names)
@@ -1,13 +1,16 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-import requests
+import re
 
+# metric name at the start of a non-comment exposition line
+_METRIC_NAME_RE = re.compile(rb"^(?!#)([A-Za-z_:][A-Za-z0-9_:]*)", re.MULTILINE)
 
-def test_exporter_metrics(prometheus_exporter, expected_metrics):
+
+def test_exporter_metrics(prometheus_exporter, expected_metrics, http_session):
     # Query the Prometheus exporter's endpoint and check that all metrics are present
-    response = requests.get("http://localhost:9684/metrics")
-    metric_names = _get_prometheus_metric_names(response.text)
+    response = http_session.get(f"{prometheus_exporter}/metrics")
+    metric_names = _get_prometheus_metric_names(response.content)
 
     assert response.status_code == 200
     assert expected_metrics.issubset(metric_names)
@@ -15,10 +18,12 @@ def test_exporter_metrics(prometheus_exporter, expected_metrics):
     assert "opensearch_dashboards_up 1.0" in response.text
 
 
-def test_exporter_failing_export_metrics(wrong_prometheus_exporter, expected_metrics):
+def test_exporter_failing_export_metrics(
+    wrong_prometheus_exporter, expected_metrics, http_session
+):
     # Prometheus server is not able to fetch the OpenSearch Dashboards metrics
-    response = requests.get("http://localhost:9684/metrics")
-    metric_names = _get_prometheus_metric_names(response.text)
+    response = http_session.get(f"{wrong_prometheus_exporter}/metrics")
+    metric_names = _get_prometheus_metric_names(response.content)
 
     assert response.status_code == 200
     assert expected_metrics.issubset(metric_names) is False
@@ -26,19 +31,15 @@ def test_exporter_failing_export_metrics(wrong_prometheus_exporter, expected_met
     assert "opensearch_dashboards_up 0.0" in response.text
 
 
-def test_exporter_wrong_path(prometheus_exporter):
+def test_exporter_wrong_path(prometheus_exporter, http_session):
     # Prometheus server is not able to fetch the OpenSearch Dashboards metrics
-    response = requests.get("http://localhost:9684/foo")
+    response = http_session.get(f"{prometheus_exporter}/foo")
 
     assert response.status_code == 404
     assert "404 Not Found" in response.text
 
 
-def _get_prometheus_metric_names(response: str) -> set[str]:
-    # remove comments from prometheus response
-    metrics_values = [
-        metrics_value for metrics_value in response.splitlines() if "#" not in metrics_value
-    ]
-    # remove values and labels to have just the metric name. E.g: opensearch_dashboards_up
-    metrics = {metric.split()[0].split("{")[0] for metric in metrics_values}
-    return metrics
+def _get_prometheus_metric_names(response: bytes) -> set[str]:
+    # single compiled scan over the raw body instead of splitlines plus per-line splits.
+    # E.g: opensearch_dashboards_up
+    return {match.group(1).decode() for match in _METRIC_NAME_RE.finditer(response)}
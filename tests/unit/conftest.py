@@ -2,11 +2,15 @@
 # See LICENSE file for licensing details.
 """Fixtures for unit tests"""
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
-from prometheus_opensearch_dashboards_exporter.collector import Config
+from prometheus_opensearch_dashboards_exporter.collector import (
+    Config,
+    DashboardsCollector,
+    collect_api_status,
+)
 
 
 @pytest.fixture
@@ -16,14 +20,21 @@ def mock_gauge():
         yield mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_config():
-    mocked_config = Config("localhost", "my-user", "my-password")
-    yield mocked_config
+    return Config("localhost", "my-user", "my-password")
+
+
+@pytest.fixture(scope="module")
+def dashboards_collector(mock_config):
+    # the collector is stateless for the default config, so one instance serves the module
+    return DashboardsCollector(mock_config)
 
 
 @pytest.fixture
 def mock_collect_api_status(api_response):
-    with patch("prometheus_opensearch_dashboards_exporter.collector.collect_api_status") as mock:
-        mock.return_value = api_response
+    # a spec'd Mock skips MagicMock's magic-method table; the patch stays function-scoped
+    # because this module also tests the real collect_api_status
+    mock = Mock(spec=collect_api_status, return_value=api_response)
+    with patch("prometheus_opensearch_dashboards_exporter.collector.collect_api_status", mock):
         yield mock
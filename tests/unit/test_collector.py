@@ -1,6 +1,9 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import json
+import operator
+from functools import partial, reduce
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -17,26 +20,22 @@ UNKNOWN_API_RESPONSE = {
 }
 
 
-def test_dashboard_collector_metrics(api_response, mock_config):
-    dashboards_collector = collector.DashboardsCollector(mock_config)
-
+def test_dashboard_collector_metrics(api_response, dashboards_collector):
     # the mocked response at dashboards_response.json is suppose to have 20 metrics
-    assert len(dashboards_collector.metrics(api_response)) == 20
-
+    assert sum(1 for _ in dashboards_collector.metrics(api_response)) == 20
 
-def test_dashboard_collector_metrics_empty_response(api_response, mock_config):
-    dashboards_collector = collector.DashboardsCollector(mock_config)
-    assert dashboards_collector.metrics({}) == []
 
+def test_dashboard_collector_metrics_empty_response(api_response, dashboards_collector):
+    assert list(dashboards_collector.metrics({})) == []
 
-def test_dashboard_collector_collect_success(mock_gauge, mock_collect_api_status, mock_config):
-    dashboards_collector = collector.DashboardsCollector(mock_config)
-    collected = [metric for metric in dashboards_collector.collect()]
 
+def test_dashboard_collector_collect_success(
+    mock_gauge, mock_collect_api_status, dashboards_collector
+):
     # the mocked response at dashboards_response.json is suppose to have 20 metrics + 1 metric if
     # the data source is reachable
-    assert len(collected) == 21
-    mock_collect_api_status.assert_called_once_with(mock_config)
+    assert sum(1 for _ in dashboards_collector.collect()) == 21
+    mock_collect_api_status.assert_called_once_with(dashboards_collector.config)
     # data source was reachable
     mock_gauge.assert_any_call(
         name=f"{collector.METRICS_PREFIX}up",
@@ -45,14 +44,14 @@ def test_dashboard_collector_collect_success(mock_gauge, mock_collect_api_status
     )
 
 
-def test_dashboard_collector_collect_failed(mock_gauge, mock_collect_api_status, mock_config):
-    dashboards_collector = collector.DashboardsCollector(mock_config)
+def test_dashboard_collector_collect_failed(
+    mock_gauge, mock_collect_api_status, dashboards_collector
+):
     # response from the API failed for some reason
     mock_collect_api_status.return_value = {}
-    collected = [metric for metric in dashboards_collector.collect()]
 
     # just the metric that the service was not reachable returns
-    assert len(collected) == 1
+    assert sum(1 for _ in dashboards_collector.collect()) == 1
     mock_gauge.assert_any_call(
         name=f"{collector.METRICS_PREFIX}up",
         documentation="Whether the data source is reachable (1 for up, 0 for down)",
@@ -61,20 +60,55 @@ def test_dashboard_collector_collect_failed(mock_gauge, mock_collect_api_status,
 
 
 @patch("prometheus_opensearch_dashboards_exporter.collector.logger")
-@patch("prometheus_opensearch_dashboards_exporter.collector.DashboardsCollector.metrics")
-def test_dashboard_collector_collect_metric_failed(
-    mock_metrics, mock_log, mock_gauge, mock_config, mock_collect_api_status
+def test_dashboard_collector_metrics_metric_failed(
+    mock_log, mock_gauge, dashboards_collector, api_response
 ):
-    dashboards_collector = collector.DashboardsCollector(mock_config)
-    # during the metrics process one metric failed to process, in this case the up time
-    mock_metrics.return_value = [
-        ("opensearch_dashboards_status", mock_gauge),
-        ("opensearch_dashboards_up_time", None),
-    ]
+    # the up time metric is missing from the API response
+    process = {
+        key: value
+        for key, value in api_response["metrics"]["process"].items()
+        if key != "uptime_in_millis"
+    }
+    response = {**api_response, "metrics": {**api_response["metrics"], "process": process}}
+
+    assert sum(1 for _ in dashboards_collector.metrics(response)) == 19
+    mock_log.error.assert_called_once_with("Could not get the metric: %s", "up_time")
+
+
+def test_dashboard_collector_ca_bundle():
+    ca_config = collector.Config(
+        "localhost", "my-user", "my-password", ca_bundle="/etc/ssl/certs/ca.pem"
+    )
+
+    try:
+        collector.DashboardsCollector(ca_config)
+        assert collector._SESSION.verify == "/etc/ssl/certs/ca.pem"
+    finally:
+        collector._SESSION.verify = False
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector.threading.Thread")
+def test_dashboard_collector_refresh_starts_thread(mock_thread, mock_collect_api_status):
+    refresh_config = collector.Config("localhost", "my-user", "my-password", refresh_interval=15)
+    dashboards_collector = collector.DashboardsCollector(refresh_config)
 
-    [metric for metric in dashboards_collector.collect()]
+    mock_thread.assert_called_once_with(target=dashboards_collector._refresh_loop, daemon=True)
+    mock_thread.return_value.start.assert_called_once()
 
-    mock_log.error.assert_called_once()
+
+@patch("prometheus_opensearch_dashboards_exporter.collector.threading.Thread")
+def test_dashboard_collector_collect_from_cache(
+    mock_thread, mock_gauge, mock_collect_api_status, api_response
+):
+    refresh_config = collector.Config("localhost", "my-user", "my-password", refresh_interval=15)
+    dashboards_collector = collector.DashboardsCollector(refresh_config)
+    dashboards_collector._cache.update(api_response)
+    mock_collect_api_status.reset_mock()
+
+    # the 21 metrics of a reachable data source plus the cache age metric
+    assert sum(1 for _ in dashboards_collector.collect()) == 22
+    # scrapes are served from the cache, not from a live API call
+    mock_collect_api_status.assert_not_called()
     mock_gauge.assert_any_call(
         name=f"{collector.METRICS_PREFIX}up",
         documentation="Whether the data source is reachable (1 for up, 0 for down)",
@@ -82,51 +116,225 @@ def test_dashboard_collector_collect_metric_failed(
     )
 
 
-@patch("prometheus_opensearch_dashboards_exporter.collector.requests.Session")
+@patch("prometheus_opensearch_dashboards_exporter.collector.time.sleep")
+@patch("prometheus_opensearch_dashboards_exporter.collector.threading.Thread")
+def test_dashboard_collector_refresh_loop(
+    mock_thread, mock_sleep, mock_collect_api_status, api_response
+):
+    refresh_config = collector.Config("localhost", "my-user", "my-password", refresh_interval=15)
+    dashboards_collector = collector.DashboardsCollector(refresh_config)
+    # break out of the refresh loop after the first iteration
+    mock_sleep.side_effect = InterruptedError
+
+    with pytest.raises(InterruptedError):
+        dashboards_collector._refresh_loop()
+
+    # the cache keeps only the subtrees the exporter reads
+    assert dashboards_collector._cache.get()[0] == {
+        "status": api_response["status"],
+        "metrics": api_response["metrics"],
+    }
+    mock_sleep.assert_called_once_with(15)
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector.logger")
+@patch("prometheus_opensearch_dashboards_exporter.collector.time.sleep")
+@patch("prometheus_opensearch_dashboards_exporter.collector.threading.Thread")
+def test_dashboard_collector_refresh_loop_survives_errors(
+    mock_thread, mock_sleep, mock_log, mock_collect_api_status
+):
+    refresh_config = collector.Config("localhost", "my-user", "my-password", refresh_interval=15)
+    dashboards_collector = collector.DashboardsCollector(refresh_config)
+    mock_collect_api_status.side_effect = ValueError("boom")
+    # break out of the refresh loop after the first iteration
+    mock_sleep.side_effect = InterruptedError
+
+    with pytest.raises(InterruptedError):
+        dashboards_collector._refresh_loop()
+
+    # the error is logged and the loop reaches the sleep instead of dying
+    mock_log.exception.assert_called_once()
+    mock_sleep.assert_called_once_with(15)
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector.threading.Thread")
+def test_dashboard_collector_collect_before_first_refresh(
+    mock_thread, mock_gauge, mock_collect_api_status
+):
+    refresh_config = collector.Config("localhost", "my-user", "my-password", refresh_interval=15)
+    dashboards_collector = collector.DashboardsCollector(refresh_config)
+
+    # an empty cache yields only the up gauge: no cache age before the first fetch lands
+    assert sum(1 for _ in dashboards_collector.collect()) == 1
+    mock_gauge.assert_called_once_with(
+        name=f"{collector.METRICS_PREFIX}up",
+        documentation="Whether the data source is reachable (1 for up, 0 for down)",
+        value=0,
+    )
+
+
+def test_prune_api_response(api_response):
+    pruned = collector._prune_api_response(api_response)
+
+    assert set(pruned) == {"status", "metrics"}
+    assert collector._prune_api_response({}) == {}
+
+
+def test_render_text(mock_collect_api_status, dashboards_collector):
+    body = dashboards_collector.render_text().decode()
+
+    assert "# HELP opensearch_dashboards_up Whether the data source is reachable" in body
+    assert "# TYPE opensearch_dashboards_up gauge\n" in body
+    assert "opensearch_dashboards_up 1.0\n" in body
+    # labelled samples keep their labels in the rendered output
+    assert "opensearch_dashboards_statuses{" in body
+
+
+def test_single_flight_executes_fetch():
+    single_flight = collector._SingleFlight()
+    fetcher = MagicMock(return_value={"fetched": True})
+
+    assert single_flight.fetch(fetcher) == {"fetched": True}
+    fetcher.assert_called_once()
+
+
+def test_single_flight_shares_inflight_result():
+    single_flight = collector._SingleFlight()
+    # simulate a call already in flight whose result is published
+    single_flight._event = collector.threading.Event()
+    single_flight._event.set()
+    single_flight._result = {"shared": True}
+    fetcher = MagicMock()
+
+    assert single_flight.fetch(fetcher) == {"shared": True}
+    fetcher.assert_not_called()
+
+
+def test_basic_auth_header():
+    # base64 of "my-user:my-password"
+    expected_header = "Basic bXktdXNlcjpteS1wYXNzd29yZA=="
+    assert collector._basic_auth_header("my-user", "my-password") == expected_header
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
 def test_collect_api_status_success(mock_session, api_response, mock_config):
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = api_response
-    mock_session.return_value.__enter__.return_value.get.return_value = mock_response
+    mock_response.content = json.dumps(dict(api_response)).encode()
+    mock_session.get.return_value = mock_response
 
     assert collector.collect_api_status(mock_config) == api_response
     mock_response.raise_for_status.assert_called_once()
+    _, kwargs = mock_session.get.call_args
+    assert kwargs["headers"] == {
+        "Authorization": collector._basic_auth_header("my-user", "my-password")
+    }
+    assert kwargs["timeout"] == collector._REQUEST_TIMEOUT
 
 
-@patch("prometheus_opensearch_dashboards_exporter.collector.requests.Session")
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
 @patch("prometheus_opensearch_dashboards_exporter.collector.logger")
 def test_collect_api_status_http_error(mock_logger, mock_session, mock_config):
     mock_response = MagicMock()
     mock_response.raise_for_status.side_effect = collector.HTTPError(
         response=MagicMock(status_code=500, text="Internal Server Error")
     )
-    mock_session.return_value.__enter__.return_value.get.return_value = mock_response
+    mock_session.get.return_value = mock_response
 
     assert collector.collect_api_status(mock_config) == {}
     mock_logger.error.assert_called_once()
 
 
 @pytest.mark.parametrize("exception", [collector.Timeout, collector.RequestException])
-@patch("prometheus_opensearch_dashboards_exporter.collector.requests.Session")
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
 @patch("prometheus_opensearch_dashboards_exporter.collector.logger")
 def test_collect_api_status_other_errors(mock_logger, mock_session, mock_config, exception):
-    mock_session.return_value.__enter__.return_value.get.side_effect = exception
+    mock_session.get.side_effect = exception
+
+    assert collector.collect_api_status(mock_config) == {}
+    mock_logger.error.assert_called_once()
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
+@patch("prometheus_opensearch_dashboards_exporter.collector.logger")
+def test_collect_api_status_invalid_json(mock_logger, mock_session, mock_config):
+    # a proxy or login page answering 200 with an HTML body must not crash the scrape
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = b"<html>login page</html>"
+    mock_session.get.return_value = mock_response
 
     assert collector.collect_api_status(mock_config) == {}
     mock_logger.error.assert_called_once()
 
 
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
+def test_collect_api_status_cache_ttl_hit(mock_session, api_response):
+    ttl_config = collector.Config("localhost", "my-user", "my-password", cache_ttl=60.0)
+    mock_response = MagicMock()
+    mock_response.content = json.dumps(dict(api_response)).encode()
+    mock_session.get.return_value = mock_response
+
+    try:
+        assert collector.collect_api_status(ttl_config) == api_response
+        # the second call within the TTL is served from the cache
+        assert collector.collect_api_status(ttl_config) == api_response
+        assert mock_session.get.call_count == 1
+    finally:
+        collector._TTL_CACHE = None
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
+def test_collect_api_status_cache_ttl_expired(mock_session, api_response):
+    ttl_config = collector.Config("localhost", "my-user", "my-password", cache_ttl=60.0)
+    mock_response = MagicMock()
+    mock_response.content = json.dumps(dict(api_response)).encode()
+    mock_session.get.return_value = mock_response
+    collector._TTL_CACHE = (collector.time.monotonic() - 120.0, {"stale": True})
+
+    try:
+        assert collector.collect_api_status(ttl_config) == api_response
+        mock_session.get.assert_called_once()
+    finally:
+        collector._TTL_CACHE = None
+
+
+@patch("prometheus_opensearch_dashboards_exporter.collector._SESSION")
+@patch("prometheus_opensearch_dashboards_exporter.collector.logger")
+def test_collect_api_status_cache_ttl_failure_not_cached(mock_logger, mock_session):
+    ttl_config = collector.Config("localhost", "my-user", "my-password", cache_ttl=60.0)
+    mock_session.get.side_effect = collector.Timeout
+
+    assert collector.collect_api_status(ttl_config) == {}
+    assert collector._TTL_CACHE is None
+
+
 def test_get_overall_status_metric(api_response, mock_gauge):
     collector._get_overall_status_metric(api_response)
     expected_value = api_response["status"]["overall"]
     mock_gauge.assert_called_with(
         name="opensearch_dashboards_status",
         documentation="General state of the dashboards cluster",
-        labels=expected_value.keys(),
+        labels=list(expected_value.keys()),
     )
     mock_gauge.add_metric.assert_called_with(list(expected_value.values()), 0)
 
 
+def test_status_label_keys_cache(api_response):
+    first_status = api_response["status"]["statuses"][0]
+
+    label_keys = collector._status_label_keys(first_status)
+
+    assert label_keys == tuple(first_status)
+    # rows with the same schema reuse the cached tuple
+    assert collector._status_label_keys(dict(first_status)) is label_keys
+    # a schema change rebuilds the cache from the new row
+    assert collector._status_label_keys({"state": "green", "extra": "label"}) == (
+        "state",
+        "extra",
+    )
+
+
 def test_get_statuses_metrics(api_response, mock_gauge):
     status_metrics = collector._get_statuses_metrics(api_response)
     # there are two statuses in the mocked api response
@@ -146,131 +354,66 @@ def test_get_status_value(status, expected_result):
     assert collector._get_status_value(status) == expected_result
 
 
-def test_get_current_connections_metric(api_response, mock_gauge):
-    expected_value = api_response["metrics"]["concurrent_connections"]
-    collector._get_current_connections_metric(api_response)
-    mock_gauge.assert_called_with(
-        name="opensearch_dashboards_current_connections",
-        documentation="OpenSearch dashboards number of concurrent connections",
-        value=expected_value,
-    )
-
-
-def test_get_up_time_metric(api_response, mock_gauge):
-    expected_value = api_response["metrics"]["process"]["uptime_in_millis"]
-    collector._get_up_time_metric(api_response)
-    mock_gauge.assert_called_with(
-        name="opensearch_dashboards_up_time",
-        documentation="OpenSearch dashboards up time in milliseconds",
-        value=expected_value,
-    )
-
-
-def test_get_event_loop_delay_metric(api_response, mock_gauge):
-    expected_value = api_response["metrics"]["process"]["event_loop_delay"]
-    collector._get_event_loop_delay_metric(api_response)
-    mock_gauge.assert_called_with(
-        name="opensearch_dashboards_event_loop_delay",
-        documentation="Opensearch dashboards event loop delay in milliseconds",
-        value=expected_value,
-    )
-
-
-def test_get_resident_set_size(api_response, mock_gauge):
-    expected_value = api_response["metrics"]["process"]["memory"]["resident_set_size_in_bytes"]
-    collector._get_resident_set_size(api_response)
-    mock_gauge.assert_called_with(
-        name="opensearch_dashboards_re_set_size",
-        documentation="Opensearch dashboards resident set size in bytes",
-        value=expected_value,
-    )
-
-
-@pytest.mark.parametrize("heap", [collector.Heap.TOTAL, collector.Heap.USED, collector.Heap.SIZE])
-def test_get_heap(api_response, mock_gauge, heap):
-    prefix = heap.value.split("_")[0]
-    expected_value = api_response["metrics"]["process"]["memory"]["heap"][heap.value]
-    collector._get_heap(api_response, heap)
-    mock_gauge.assert_called_with(
-        name=f"opensearch_dashboards_heap_{prefix}",
-        documentation=f"Opensearch dashboards memory heap {prefix} in bytes",
-        value=expected_value,
-    )
-
-
-@pytest.mark.parametrize(
-    "load", [collector.Load.ONE_M, collector.Load.FIVE_M, collector.Load.FIFTEEN_M]
-)
-def test_get_load(api_response, mock_gauge, load):
-    expected_value = api_response["metrics"]["os"]["load"][load.value]
-    collector._get_load(api_response, load)
-    mock_gauge.assert_called_with(
-        name=f"opensearch_dashboards_load_{load.value}",
-        documentation=f"OpenSearch dashboards load average {load.value}",
-        value=expected_value,
-    )
+# every scalar getter with the enum member it takes (None for the plain ones) and the suffix
+# of its entry in the spec table, which holds the expected name, documentation and path
+SCALAR_METRIC_CASES = [
+    (collector._get_current_connections_metric, None, "current_connections"),
+    (collector._get_up_time_metric, None, "up_time"),
+    (collector._get_event_loop_delay_metric, None, "event_loop_delay"),
+    (collector._get_resident_set_size, None, "re_set_size"),
+    *[(collector._get_heap, heap, collector._ENUM_SUFFIX[heap]) for heap in collector.Heap],
+    *[(collector._get_load, load, collector._ENUM_SUFFIX[load]) for load in collector.Load],
+    *[
+        (collector._get_os_mem, memory, collector._ENUM_SUFFIX[memory])
+        for memory in collector.Memory
+    ],
+    *[
+        (collector._get_resp_time, response, collector._ENUM_SUFFIX[response])
+        for response in collector.Response
+    ],
+    *[(collector._get_req, req, collector._ENUM_SUFFIX[req]) for req in collector.RequestsCount],
+]
 
 
 @pytest.mark.parametrize(
-    "memory", [collector.Memory.USED, collector.Memory.FREE, collector.Memory.TOTAL]
+    "getter, enum_member, suffix",
+    SCALAR_METRIC_CASES,
+    ids=[case[2] for case in SCALAR_METRIC_CASES],
 )
-def test_get_os_mem(api_response, mock_gauge, memory):
-    prefix = memory.value.split("_")[0]
-    expected_value = api_response["metrics"]["os"]["memory"][memory.value]
-    collector._get_os_mem(api_response, memory)
-    mock_gauge.assert_called_with(
-        name=f"opensearch_dashboards_os_mem_{prefix}",
-        documentation=f"OpenSearch dashboards memory {prefix} in bytes",
-        value=expected_value,
-    )
+def test_scalar_metric_getters(api_response, mock_gauge, getter, enum_member, suffix):
+    name, documentation, parent_path, key = collector._SCALAR_METRIC_SPECS[suffix]
+    expected_value = reduce(operator.getitem, (*parent_path, key), api_response)
 
+    if enum_member is None:
+        getter(api_response)
+    else:
+        getter(api_response, enum_member)
 
-@pytest.mark.parametrize("response", [collector.Response.AVG, collector.Response.MAX])
-def test_get_resp_time(api_response, mock_gauge, response):
-    prefix = response.value.split("_")[0]
-    expected_value = api_response["metrics"]["response_times"][response.value]
-    collector._get_resp_time(api_response, response)
-    mock_gauge.assert_called_with(
-        name=f"opensearch_dashboards_resp_time_{prefix}",
-        documentation=f"OpenSearch dashboards {prefix} response time in milliseconds",
-        value=expected_value,
-    )
-
-
-@pytest.mark.parametrize(
-    "request_count", [collector.RequestsCount.DISCONNECTS, collector.RequestsCount.TOTAL]
-)
-def test_get_req(api_response, mock_gauge, request_count):
-    request_count_value = request_count.value
-    expected_value = api_response["metrics"]["requests"][request_count_value]
-    collector._get_req(api_response, request_count)
-    mock_gauge.assert_called_with(
-        name=f"opensearch_dashboards_req_{request_count_value}",
-        documentation=f"OpenSearch dashboards request {request_count_value} count",
-        value=expected_value,
-    )
+    mock_gauge.assert_called_with(name=name, documentation=documentation, value=expected_value)
 
 
+# callables, not results: evaluating the getters at collection time would run them before
+# the mock_gauge fixture is active and share one return value across the whole session
 @pytest.mark.parametrize(
-    "result_unknown_api",
+    "getter",
     [
-        collector._get_overall_status_metric(UNKNOWN_API_RESPONSE),
-        collector._get_current_connections_metric(UNKNOWN_API_RESPONSE),
-        collector._get_up_time_metric(UNKNOWN_API_RESPONSE),
-        collector._get_event_loop_delay_metric(UNKNOWN_API_RESPONSE),
-        collector._get_resident_set_size(UNKNOWN_API_RESPONSE),
-        collector._get_heap(UNKNOWN_API_RESPONSE, collector.Heap.SIZE),
-        collector._get_load(UNKNOWN_API_RESPONSE, collector.Load.ONE_M),
-        collector._get_os_mem(UNKNOWN_API_RESPONSE, collector.Memory.TOTAL),
-        collector._get_resp_time(UNKNOWN_API_RESPONSE, collector.Response.AVG),
-        collector._get_req(UNKNOWN_API_RESPONSE, collector.RequestsCount.DISCONNECTS),
+        collector._get_overall_status_metric,
+        collector._get_current_connections_metric,
+        collector._get_up_time_metric,
+        collector._get_event_loop_delay_metric,
+        collector._get_resident_set_size,
+        partial(collector._get_heap, heap=collector.Heap.SIZE),
+        partial(collector._get_load, load=collector.Load.ONE_M),
+        partial(collector._get_os_mem, memory=collector.Memory.TOTAL),
+        partial(collector._get_resp_time, response=collector.Response.AVG),
+        partial(collector._get_req, req=collector.RequestsCount.DISCONNECTS),
     ],
 )
-def test_get_unknown_api_response(result_unknown_api, mock_gauge):
-    assert result_unknown_api is None
-    assert mock_gauge.assert_not_called
+def test_get_unknown_api_response(getter, mock_gauge):
+    assert getter(UNKNOWN_API_RESPONSE) is None
+    mock_gauge.assert_not_called()
 
 
 def test_get_unknown_statuses_api_response(mock_gauge):
     assert collector._get_statuses_metrics(UNKNOWN_API_RESPONSE) == []
-    assert mock_gauge.assert_not_called
+    mock_gauge.assert_not_called()
@@ -2,7 +2,7 @@
 # See LICENSE file for licensing details.
 
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
@@ -21,18 +21,64 @@ def test_setup_logging(caplog):
     assert log_record.message == "Test log message"
 
 
+@patch("prometheus_opensearch_dashboards_exporter.main.logging.basicConfig")
+def test_setup_logging_idempotent(mock_basic_config):
+    with patch.object(main.logging.getLogger(), "handlers", []):
+        main.setup_logging()
+    mock_basic_config.assert_called_once()
+
+    # a configured root logger is left untouched
+    with patch.object(main.logging.getLogger(), "handlers", [MagicMock()]):
+        main.setup_logging()
+    mock_basic_config.assert_called_once()
+
+
 @pytest.mark.parametrize(
-    "command, expected_url, expected_port",
+    "command, expected_url, expected_port, expected_refresh_interval, expected_cache_ttl, "
+    "expected_ca_bundle, expected_threads",
     [
-        (["--url", "http://10.12.21.8:5601", "--port", "8080"], "http://10.12.21.8:5601", 8080),
-        # default port and url
-        ([], "http://localhost:5601", 9684),
+        (
+            [
+                "--url",
+                "http://10.12.21.8:5601",
+                "--port",
+                "8080",
+                "--refresh-interval",
+                "30",
+                "--cache-ttl",
+                "10",
+                "--ca-bundle",
+                "/etc/ssl/certs/ca.pem",
+                "--threads",
+                "8",
+            ],
+            "http://10.12.21.8:5601",
+            8080,
+            30.0,
+            10.0,
+            "/etc/ssl/certs/ca.pem",
+            8,
+        ),
+        # default port, url, refresh interval, cache ttl, ca bundle and threads
+        ([], "http://localhost:5601", 9684, 15.0, 5.0, None, 4),
     ],
 )
-def test_parse_command_line(command, expected_url, expected_port):
+def test_parse_command_line(
+    command,
+    expected_url,
+    expected_port,
+    expected_refresh_interval,
+    expected_cache_ttl,
+    expected_ca_bundle,
+    expected_threads,
+):
     args = main.parse_command_line(command)
     assert args.url == expected_url
     assert args.port == expected_port
+    assert args.refresh_interval == expected_refresh_interval
+    assert args.cache_ttl == expected_cache_ttl
+    assert args.ca_bundle == expected_ca_bundle
+    assert args.threads == expected_threads
 
 
 @pytest.mark.parametrize("args", [["-h"], ["--help"], ["help"]])
@@ -46,33 +92,79 @@ def test_parse_command_line_help(mock_exit, args):
         main.parse_command_line(args)
 
 
+@pytest.fixture
+def fast_path_collector():
+    mocked_collector = MagicMock()
+    main._set_collector(mocked_collector)
+    yield mocked_collector
+    main._set_collector(None)
+
+
+def test_metrics_app_fast_path(fast_path_collector):
+    fast_path_collector.render_text.return_value = b"opensearch_dashboards_up 1.0\n"
+    mocked_start_response = Mock()
+
+    response = main.metrics_app({"PATH_INFO": "/metrics"}, mocked_start_response)
+
+    assert response == [b"opensearch_dashboards_up 1.0\n"]
+    mocked_start_response.assert_called_once_with(
+        "200 OK", [("Content-Type", main.CONTENT_TYPE_LATEST)]
+    )
+
+
+@patch("prometheus_opensearch_dashboards_exporter.main.APP")
+def test_metrics_app_openmetrics_falls_back(mocked_app, fast_path_collector):
+    mocked_environ = {"PATH_INFO": "/metrics", "HTTP_ACCEPT": "application/openmetrics-text"}
+    mocked_start_response = Mock()
+
+    main.metrics_app(mocked_environ, mocked_start_response)
+
+    mocked_app.assert_called_with(mocked_environ, mocked_start_response)
+    fast_path_collector.render_text.assert_not_called()
+
+
+def test_metrics_app_builds_app_lazily():
+    mocked_environ = {"PATH_INFO": "/metrics", "QUERY_STRING": "", "REQUEST_METHOD": "GET"}
+    mocked_start_response = Mock()
+
+    with patch.object(main, "APP", None):
+        response = main.metrics_app(mocked_environ, mocked_start_response)
+        assert main.APP is not None
+
+    assert response
+
+
 @patch("prometheus_opensearch_dashboards_exporter.main.APP")
 def test_metrics_app(mocked_app):
-    mocked_environ = MagicMock()
-    mocked_environ.get.return_value = "/metrics"
-    mocked_start_response = MagicMock()
+    mocked_environ = {"PATH_INFO": "/metrics"}
+    mocked_start_response = Mock()
 
     main.metrics_app(mocked_environ, mocked_start_response)
     mocked_app.assert_called_with(mocked_environ, mocked_start_response)
 
 
-def test_metrics_app_root_path():
-    mocked_environ = MagicMock()
-    mocked_environ.get.return_value = "/"
-    mocked_start_response = MagicMock()
+@pytest.fixture(scope="session")
+def index_html_bytes():
+    # read the landing page once per session instead of per test
     html_file = (
         Path(__file__).resolve().parents[2]
         / "src/prometheus_opensearch_dashboards_exporter/index.html"
     )
-    assert main.metrics_app(mocked_environ, mocked_start_response) == [html_file.read_bytes()]
+    return html_file.read_bytes()
+
+
+def test_metrics_app_root_path(index_html_bytes):
+    mocked_environ = {"PATH_INFO": "/"}
+    mocked_start_response = Mock()
+
+    assert main.metrics_app(mocked_environ, mocked_start_response) == [index_html_bytes]
     mocked_start_response.assert_called_once_with("200 OK", [("Content-Type", "text/html")])
 
 
-@patch("pathlib.Path.exists", return_value=False)
-def test_metrics_app_root_path_missing_html(_):
-    mocked_environ = MagicMock()
-    mocked_environ.get.return_value = "/"
-    mocked_start_response = MagicMock()
+@patch("prometheus_opensearch_dashboards_exporter.main._INDEX_HTML", None)
+def test_metrics_app_root_path_missing_html():
+    mocked_environ = {"PATH_INFO": "/"}
+    mocked_start_response = Mock()
     assert main.metrics_app(mocked_environ, mocked_start_response) == [b"500 HTML Page Not Found"]
     mocked_start_response.assert_called_once_with(
         "500 Internal Error", [("Content-Type", "text/plain")]
@@ -81,13 +173,13 @@ def test_metrics_app_root_path_missing_html(_):
 
 @pytest.mark.parametrize("path", ["/foo", "/metrics/thread"])
 def test_metrics_app_other_path(path):
-    mocked_environ = MagicMock()
-    mocked_environ.get.return_value = path
-    mocked_start_response = MagicMock()
+    mocked_environ = {"PATH_INFO": path}
+    mocked_start_response = Mock()
 
     assert main.metrics_app(mocked_environ, mocked_start_response) == [b"404 Not Found"]
 
 
+@patch("prometheus_opensearch_dashboards_exporter.main._waitress_serve", None)
 @patch("prometheus_opensearch_dashboards_exporter.main.DashboardsCollector")
 @patch("prometheus_opensearch_dashboards_exporter.main.REGISTRY")
 @patch("prometheus_opensearch_dashboards_exporter.main.make_server")
@@ -107,6 +199,42 @@ def test_main(
 
     mock_cli.assert_called_once()
     mock_setup_logging.assert_called_once()
-    mock_server.assert_called_once_with("", 9684, mock_metrics_app)
+    mock_server.assert_called_once_with(
+        "", 9684, mock_metrics_app, server_class=main._ThreadingWSGIServer
+    )
     mock_collector.assert_called_once()
     mock_registry.register.assert_called_once()
+    # the default platform/process/gc collectors are dropped so both render paths agree
+    assert mock_registry.unregister.call_count == 3
+    main._set_collector(None)
+
+
+@patch("prometheus_opensearch_dashboards_exporter.main._waitress_serve")
+@patch("prometheus_opensearch_dashboards_exporter.main.DashboardsCollector")
+@patch("prometheus_opensearch_dashboards_exporter.main.REGISTRY")
+@patch("prometheus_opensearch_dashboards_exporter.main.make_server")
+@patch("prometheus_opensearch_dashboards_exporter.main.metrics_app")
+@patch("prometheus_opensearch_dashboards_exporter.main.setup_logging")
+@patch("prometheus_opensearch_dashboards_exporter.main.parse_command_line")
+def test_main_waitress(
+    mock_cli,
+    mock_setup_logging,
+    mock_metrics_app,
+    mock_server,
+    mock_registry,
+    mock_collector,
+    mock_waitress_serve,
+):
+    cli_response = MagicMock()
+    cli_response.port = 9684
+    cli_response.threads = 4
+    cli_response.url = "https://localhost"
+    mock_cli.return_value = cli_response
+
+    main.main()
+
+    mock_waitress_serve.assert_called_once_with(
+        mock_metrics_app, host="0.0.0.0", port=9684, threads=4
+    )
+    mock_server.assert_not_called()
+    main._set_collector(None)